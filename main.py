@@ -1,14 +1,31 @@
+import atexit
+import io
 import json
+import math
 import os
-from typing import Optional
-from datetime import datetime, timedelta
+import re
+from typing import Literal, Optional
+from functools import cache
+from datetime import datetime, time, timedelta, timezone
 import hashlib
+import hmac
+import importlib.util
 import secrets
-from pymongo import MongoClient
+import threading
+from pymongo import IndexModel, MongoClient, ReturnDocument, UpdateOne, WriteConcern
 from pymongo.errors import PyMongoError
 from dotenv import load_dotenv
 from fastmcp import FastMCP
+import bson
 from bson import ObjectId
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+# Optional faster JSON parser for categories.json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Load environment variables
 load_dotenv()
@@ -25,27 +42,191 @@ MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017/expense_tracke
 # Session configuration - Token expires after 24 hours by default
 SESSION_TIMEOUT_HOURS = int(os.getenv("SESSION_TIMEOUT_HOURS", "24"))
 
+# PBKDF2 work factor for new password hashes
+PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", "600000"))
+
+# Upper bound on the expenses returned by a single listing call, to keep responses bounded
+MAX_ROWS = int(os.getenv("MAX_ROWS", "5000"))
+
+# Expenses rewritten per bulk_write round-trip by the search field backfill
+MIGRATION_BATCH_SIZE = 1000
+
+# Search terms containing punctuation fall back to literal prefix matching: the text
+# index tokenizer drops it, and $text reads "-" as negation and '"' as a phrase.
+# Unlike the FTS5 tokenizer in test.py, it keeps "_" inside words.
+PUNCTUATION = re.compile(r"[^\w\s]")
+
+# Fields the listing and detail tools actually print
+EXPENSE_LIST_FIELDS = {"description": 1, "amount": 1, "category": 1, "date": 1}
+EXPENSE_DETAIL_FIELDS = {**EXPENSE_LIST_FIELDS, "created_at": 1}
+
+# Per-row output templates, parsed once instead of per formatted row
+EXPENSE_ROW_TEMPLATE = (
+    "ID: {_id}\n"
+    "  Description: {description}\n"
+    "  Amount: ${amount:.2f}\n"
+    "  Category: {category}\n"
+    "  Date: {date:%Y-%m-%d}\n"
+    + "-" * 60 + "\n"
+)
+DATED_EXPENSE_ROW_TEMPLATE = (
+    "ID: {_id}\n"
+    "  Date: {date:%Y-%m-%d}\n"
+    "  Description: {description}\n"
+    "  Category: {category}\n"
+    "  Amount: ${amount:.2f}\n"
+    + "-" * 60 + "\n"
+)
+SUMMARY_ITEM_TEMPLATE = "   • {date:%Y-%m-%d} | {description}: ${amount:.2f}\n"
+
+# Bound formatters, so the hot loops make a single call per row
+format_expense_row = EXPENSE_ROW_TEMPLATE.format
+format_dated_expense_row = DATED_EXPENSE_ROW_TEMPLATE.format
+format_summary_item = SUMMARY_ITEM_TEMPLATE.format_map
+
+
+def _available_compressors() -> str:
+    """Wire compressors to offer the server, fastest first; zlib is always available."""
+    compressors = []
+    if importlib.util.find_spec("zstandard"):
+        compressors.append("zstd")
+    if importlib.util.find_spec("snappy"):
+        compressors.append("snappy")
+    compressors.append("zlib")
+    return ",".join(compressors)
+
+
+# Shared client - PyMongo pools connections internally, so a single client is
+# reused by every tool call. It is created on first use rather than at import,
+# so loading the module to register tools doesn't start the driver's pool and
+# monitor threads or open connections.
+_client: Optional[MongoClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> MongoClient:
+    """
+    Return the shared MongoClient, creating it on first use.
+    
+    Returns:
+        MongoClient instance
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                client = MongoClient(
+                    MONGODB_URL,
+                    maxPoolSize=200,
+                    minPoolSize=10,
+                    maxIdleTimeMS=300000,
+                    compressors=_available_compressors(),
+                    appname="expense_tracker"
+                )
+                # The tools hint the expense indexes and format expense dates as
+                # BSON dates, so bring the expenses up to date before the client
+                # is handed to any tool
+                try:
+                    prepare_expenses(client.get_database())
+                except PyMongoError:
+                    client.close()
+                    raise
+                atexit.register(client.close)
+                _client = client
+    return _client
+
 
 def get_db_connection():
     """
-    Create and return a connection to the MongoDB database.
+    Return the shared MongoDB database handle.
     
     Returns:
         MongoDB database object
     """
-    try:
-        client = MongoClient(MONGODB_URL)
-        # Test the connection
-        client.admin.command('ping')
-        db = client.get_database()
-        return db
-    except PyMongoError as e:
-        raise PyMongoError(f"Failed to connect to MongoDB: {e}")
+    return get_client().get_database()
+
+
+@cache
+def get_users_collection():
+    """Return the users collection handle."""
+    return get_db_connection()["users"]
+
 
+@cache
+def get_sessions_collection():
+    """
+    Return the sessions collection handle.
+    Session times are stored in UTC since the TTL monitor expires documents against UTC.
+    """
+    return get_db_connection().get_collection("sessions", codec_options=CodecOptions(tz_aware=True))
+
+
+@cache
+def get_expenses_collection():
+    """
+    Return the expenses collection handle used for writes and dict reads.
+    Expense writes are acknowledged once applied rather than once journaled;
+    users and sessions keep the client's default durability.
+    """
+    return get_db_connection().get_collection(
+        "expenses",
+        codec_options=CodecOptions(tz_aware=False),
+        write_concern=WriteConcern(w=1, j=False)
+    )
 
-def hash_password(password: str) -> str:
-    """Hash a password using SHA-256."""
-    return hashlib.sha256(password.encode()).hexdigest()
+
+@cache
+def get_raw_expenses_collection():
+    """
+    Return an expenses collection handle that yields RawBSONDocument.
+    Raw documents are only decoded when a field is accessed; used by the
+    list/search tools that just print a handful of fields per row.
+    """
+    return get_db_connection().get_collection("expenses", codec_options=CodecOptions(document_class=RawBSONDocument))
+
+
+def hash_password(password: str, salt: bytes, iterations: int = PASSWORD_HASH_ITERATIONS) -> str:
+    """Hash a password with salted PBKDF2-HMAC-SHA256."""
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations).hex()
+
+
+def password_fields(password: str) -> dict:
+    """
+    Hash a password with a fresh salt.
+    
+    Args:
+        password: Plain-text password
+    
+    Returns:
+        User document fields holding the hash, salt and iteration count
+    """
+    salt = secrets.token_bytes(16)
+    return {
+        "password_hash": hash_password(password, salt),
+        "password_salt": salt.hex(),
+        "password_iterations": PASSWORD_HASH_ITERATIONS
+    }
+
+
+def verify_password(user: dict, password: str) -> bool:
+    """
+    Check a password against a user's stored hash.
+    Users registered before salted hashing have a bare SHA-256 hash and no salt.
+    
+    Args:
+        user: User document
+        password: Plain-text password to check
+    
+    Returns:
+        True if the password matches
+    """
+    if "password_salt" not in user:
+        candidate = hashlib.sha256(password.encode()).hexdigest()
+    else:
+        salt = bytes.fromhex(user["password_salt"])
+        candidate = hash_password(password, salt, user["password_iterations"])
+    # Constant-time comparison so response timing doesn't leak hash prefixes
+    return hmac.compare_digest(user["password_hash"], candidate)
 
 
 def generate_session_token() -> str:
@@ -53,6 +234,50 @@ def generate_session_token() -> str:
     return secrets.token_urlsafe(32)
 
 
+def ensure_expense_indexes(db) -> None:
+    """
+    Create the expense indexes the tools rely on and drop the ones they superseded.
+    Idempotent, so it is safe to run against an already initialized database.
+    
+    Args:
+        db: MongoDB database object
+    """
+    expenses_collection = db["expenses"]
+    expenses_collection.create_indexes([
+        IndexModel([("user_id", 1), ("description_norm", 1)]),
+        IndexModel([("user_id", 1), ("description_lc", 1)]),
+        IndexModel([("user_id", 1), ("category_lc", 1)]),
+        IndexModel(
+            [("description", "text"), ("category", "text")],
+            weights={"description": 10, "category": 5},
+            name="desc_cat_text"
+        ),
+        # Equality-then-range indexes for the date range tools; user_id leads
+        # since every query is scoped to the logged-in user
+        IndexModel([("user_id", 1), ("category", 1), ("date", 1)], name="category_date"),
+        IndexModel([("user_id", 1), ("date", 1), ("_id", 1)], name="date_id")
+    ])
+    
+    # Superseded by the user_id-prefixed compound indexes: every expense query is
+    # scoped to one user, and date_id walked backwards serves the newest-first listing
+    existing_indexes = expenses_collection.index_information()
+    for index_name in ("category_1", "description_1", "user_id_1", "date_1", "user_id_1_date_-1"):
+        if index_name in existing_indexes:
+            expenses_collection.drop_index(index_name)
+
+
+def prepare_expenses(db) -> None:
+    """
+    Build the expense indexes and convert legacy string dates.
+    Run by get_client when the shared client is created.
+    
+    Args:
+        db: MongoDB database object
+    """
+    ensure_expense_indexes(db)
+    migrate_expense_dates(db)
+
+
 def init_database() -> None:
     """
     Initialize the MongoDB database with required collections and indexes.
@@ -60,28 +285,33 @@ def init_database() -> None:
     try:
         db = get_db_connection()
         
-        # Create users collection if it doesn't exist
-        if "users" not in db.list_collection_names():
-            db.create_collection("users")
+        # create_indexes is idempotent and implicitly creates missing collections,
+        # so each collection is set up in one round-trip without an existence check
+        users_collection = db["users"]
+        users_collection.create_indexes([
+            IndexModel("username", unique=True),
+            IndexModel("email", unique=True)
+        ])
+        
+        # Superseded by the sessions collection
+        existing_indexes = users_collection.index_information()
+        for index_name in ("session_token_1", "session_expires_at_1"):
+            if index_name in existing_indexes:
+                users_collection.drop_index(index_name)
         
-        # Create expenses collection if it doesn't exist
-        if "expenses" not in db.list_collection_names():
-            db.create_collection("expenses")
+        # Sessions are keyed by token; MongoDB deletes them once expires_at passes
+        sessions_collection = db["sessions"]
+        sessions_collection.create_indexes([
+            IndexModel("expires_at", expireAfterSeconds=0),
+            IndexModel("user_id")
+        ])
         
-        # Create indexes for users collection
-        users_collection = db["users"]
-        users_collection.create_index("username", unique=True)
-        users_collection.create_index("email", unique=True)
-        users_collection.create_index("session_token")
-        users_collection.create_index("session_expires_at")
-        
-        # Create indexes for expenses collection
-        expenses_collection = db["expenses"]
-        expenses_collection.create_index("user_id")
-        expenses_collection.create_index("date")
-        expenses_collection.create_index("category")
-        expenses_collection.create_index("description")
-        expenses_collection.create_index([("user_id", 1), ("date", -1)])
+        # The expense indexes and date migration are run by get_client on first use
+        
+        migrate_expense_search_fields()
+        
+        if not bson.has_c():
+            print("⚠️ PyMongo C extensions are not installed - BSON decoding will be slow")
         
         print(f"✓ MongoDB database initialized successfully")
         
@@ -89,6 +319,59 @@ def init_database() -> None:
         raise PyMongoError(f"Database initialization failed: {e}")
 
 
+def migrate_expense_dates(db) -> int:
+    """
+    Convert expense dates stored as YYYY-MM-DD strings into BSON dates.
+    Safe to run repeatedly; already converted expenses are left untouched.
+    
+    Args:
+        db: MongoDB database object
+    
+    Returns:
+        Number of expenses converted
+    """
+    expenses_collection = db["expenses"]
+    result = expenses_collection.update_many(
+        {"date": {"$type": "string"}},
+        [{"$set": {"date": {"$dateFromString": {"dateString": "$date", "format": "%Y-%m-%d"}}}}]
+    )
+    if result.modified_count:
+        print(f"✓ Converted {result.modified_count} expense date(s) to BSON dates")
+    return result.modified_count
+
+
+def migrate_expense_search_fields() -> int:
+    """
+    Add the lowercased/normalized description and category copies to expenses
+    stored before those fields existed.
+    The copies are computed with normalize_description and str.lower, the same
+    as build_expense_doc, since MongoDB's $toLower only lowercases ASCII.
+    Safe to run repeatedly; expenses that already have them are left untouched.
+    
+    Returns:
+        Number of expenses updated
+    """
+    expenses_collection = get_db_connection()["expenses"]
+    legacy = expenses_collection.find({"description_norm": {"$exists": False}}, {"description": 1, "category": 1})
+    modified = 0
+    updates = []
+    for expense in legacy:
+        description = expense.get("description") or ""
+        updates.append(UpdateOne({"_id": expense["_id"]}, {"$set": {
+            "description_lc": description.lower(),
+            "description_norm": normalize_description(description),
+            "category_lc": (expense.get("category") or "").lower()
+        }}))
+        if len(updates) == MIGRATION_BATCH_SIZE:
+            modified += expenses_collection.bulk_write(updates, ordered=False).modified_count
+            updates = []
+    if updates:
+        modified += expenses_collection.bulk_write(updates, ordered=False).modified_count
+    if modified:
+        print(f"✓ Added search fields to {modified} expense(s)")
+    return modified
+
+
 def initialize_expense_database() -> str:
     """Initialize the expense tracker database with required collections."""
     try:
@@ -112,27 +395,23 @@ def register_user(username: str, email: str, password: str) -> str:
         Success message with user_id or error message
     """
     try:
-        db = get_db_connection()
-        users_collection = db["users"]
-        
         # Check if username or email already exists
-        if users_collection.find_one({"username": username}):
+        if get_users_collection().find_one({"username": username}, {"_id": 1}):
             return f"❌ Username '{username}' already exists"
         
-        if users_collection.find_one({"email": email}):
+        if get_users_collection().find_one({"email": email}, {"_id": 1}):
             return f"❌ Email '{email}' already registered"
         
         # Create user document
         user_doc = {
             "username": username,
             "email": email,
-            "password_hash": hash_password(password),
-            "created_at": datetime.now(),
-            "session_token": None,
-            "session_expires_at": None
+            **password_fields(password),
+            # UTC, like last_login and the session times
+            "created_at": datetime.now(timezone.utc)
         }
         
-        result = users_collection.insert_one(user_doc)
+        result = get_users_collection().insert_one(user_doc)
         return f"✓ User registered successfully! User ID: {result.inserted_id}"
     except PyMongoError as e:
         return f"❌ Error registering user: {str(e)}"
@@ -151,11 +430,8 @@ def login_user(username: str, password: str) -> str:
         Success message with session token or error message
     """
     try:
-        db = get_db_connection()
-        users_collection = db["users"]
-        
         # Find user by username or email
-        user = users_collection.find_one({
+        user = get_users_collection().find_one({
             "$or": [
                 {"username": username},
                 {"email": username}
@@ -166,24 +442,35 @@ def login_user(username: str, password: str) -> str:
             return "❌ Invalid username or password"
         
         # Verify password
-        if user["password_hash"] != hash_password(password):
+        if not verify_password(user, password):
             return "❌ Invalid username or password"
         
         # Generate session token and expiration time
+        now = datetime.now(timezone.utc)
         session_token = generate_session_token()
-        expires_at = datetime.now() + timedelta(hours=SESSION_TIMEOUT_HOURS)
+        expires_at = now + timedelta(hours=SESSION_TIMEOUT_HOURS)
+        
+        get_sessions_collection().insert_one({
+            "_id": session_token,
+            "user_id": user["_id"],
+            "username": user["username"],
+            "created_at": now,
+            "last_seen": now,
+            "expires_at": expires_at
+        })
+        
+        updates = {"last_login": now}
+        
+        # Upgrade legacy unsalted hashes now that we have the plain password
+        if "password_salt" not in user:
+            updates.update(password_fields(password))
         
-        # Update user with session token and expiration
-        users_collection.update_one(
+        get_users_collection().update_one(
             {"_id": user["_id"]},
-            {"$set": {
-                "session_token": session_token,
-                "session_expires_at": expires_at,
-                "last_login": datetime.now()
-            }}
+            {"$set": updates}
         )
         
-        return f"✓ Login successful!\nUser ID: {user['_id']}\nSession Token: {session_token}\nExpires: {expires_at.strftime('%Y-%m-%d %H:%M:%S')}\n\n⚠️ Save this session token - you'll need it for all expense operations!\n💡 Session valid for {SESSION_TIMEOUT_HOURS} hours"
+        return f"✓ Login successful!\nUser ID: {user['_id']}\nSession Token: {session_token}\nExpires: {expires_at.astimezone().strftime('%Y-%m-%d %H:%M:%S')}\n\n⚠️ Save this session token - you'll need it for all expense operations!\n💡 Session valid for {SESSION_TIMEOUT_HOURS} hours"
     except PyMongoError as e:
         return f"❌ Error during login: {str(e)}"
 
@@ -200,32 +487,27 @@ def check_session_status(session_token: str) -> str:
         Session status information
     """
     try:
-        db = get_db_connection()
-        users_collection = db["users"]
-        
-        user = users_collection.find_one({"session_token": session_token})
+        session = get_sessions_collection().find_one({"_id": session_token}, {"username": 1, "expires_at": 1})
         
-        if not user:
+        if not session:
             return "❌ Invalid session token"
         
-        if not user.get("session_expires_at"):
-            return "⚠️ Session found but no expiration set (legacy session)"
-        
-        expires_at = user["session_expires_at"]
-        now = datetime.now()
+        expires_at = session["expires_at"]
+        now = datetime.now(timezone.utc)
         
+        # The TTL monitor runs about once a minute, so a session can briefly outlive its expiry
         if now > expires_at:
-            return f"❌ Session expired at {expires_at.strftime('%Y-%m-%d %H:%M:%S')}"
+            return f"❌ Session expired at {expires_at.astimezone().strftime('%Y-%m-%d %H:%M:%S')}"
         
         time_remaining = expires_at - now
         hours_remaining = time_remaining.total_seconds() / 3600
         
-        result = f"✓ Session is valid\n"
-        result += f"User: {user['username']}\n"
-        result += f"Expires at: {expires_at.strftime('%Y-%m-%d %H:%M:%S')}\n"
-        result += f"Time remaining: {hours_remaining:.1f} hours"
-        
-        return result
+        return (
+            f"✓ Session is valid\n"
+            f"User: {session['username']}\n"
+            f"Expires at: {expires_at.astimezone().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"Time remaining: {hours_remaining:.1f} hours"
+        )
     except PyMongoError as e:
         return f"❌ Error checking session: {str(e)}"
 
@@ -242,15 +524,9 @@ def logout_user(session_token: str) -> str:
         Success or error message
     """
     try:
-        db = get_db_connection()
-        users_collection = db["users"]
-        
-        result = users_collection.update_one(
-            {"session_token": session_token},
-            {"$set": {"session_token": None, "session_expires_at": None}}
-        )
+        result = get_sessions_collection().delete_one({"_id": session_token})
         
-        if result.modified_count > 0:
+        if result.deleted_count > 0:
             return "✓ Logged out successfully"
         else:
             return "❌ Invalid session token"
@@ -266,33 +542,197 @@ def get_user_from_token(session_token: str):
         session_token: User's session token
     
     Returns:
-        User document or None (if token invalid or expired)
+        User document with _id and username, or None (if token invalid or expired)
     """
     try:
-        db = get_db_connection()
-        users_collection = db["users"]
-        
-        # Find user with this token
-        user = users_collection.find_one({"session_token": session_token})
-        
-        if not user:
+        now = datetime.now(timezone.utc)
+        # Validate the token and expiry and record activity in one atomic round-trip;
+        # expired sessions are deleted by the TTL index, the expiry filter covers
+        # the window before the TTL monitor gets to them
+        session = get_sessions_collection().find_one_and_update(
+            {"_id": session_token, "expires_at": {"$gt": now}},
+            {"$set": {"last_seen": now}},
+            projection={"user_id": 1, "username": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if not session:
             return None
-        
-        # Check if session has expired
-        if user.get("session_expires_at"):
-            if datetime.now() > user["session_expires_at"]:
-                # Session expired - clear the token
-                users_collection.update_one(
-                    {"_id": user["_id"]},
-                    {"$set": {"session_token": None, "session_expires_at": None}}
-                )
-                return None
-        
-        return user
+        return {"_id": session["user_id"], "username": session["username"]}
     except PyMongoError:
         return None
 
 
+def parse_date(value: str) -> datetime:
+    """Parse a YYYY-MM-DD string into the midnight datetime stored as an expense date."""
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def normalize_description(description: str) -> str:
+    """Lowercase a description and collapse runs of whitespace for exact matching."""
+    return " ".join(description.lower().split())
+
+
+def parse_amount(value) -> Optional[float]:
+    """Coerce an expense amount (a number or numeric string) to a finite float; None if it isn't one."""
+    if isinstance(value, bool):
+        return None
+    try:
+        amount = float(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    # "nan", "inf" and out-of-range values like "1e400" would poison every total
+    return amount if math.isfinite(amount) else None
+
+
+def description_match(user_id: ObjectId, description: str) -> dict:
+    """
+    Build the filter matching a user's expenses by description, ignoring case and extra whitespace.
+    Expenses not yet backfilled by migrate_expense_search_fields are matched on the raw description.
+    """
+    return {
+        "user_id": user_id,
+        "$or": [
+            {"description_norm": normalize_description(description)},
+            {"description_norm": {"$exists": False}, "description": description}
+        ]
+    }
+
+
+def build_expense_doc(user_id: ObjectId, description: str, amount: float, category: str, now: Optional[datetime] = None) -> dict:
+    """
+    Build an expense document ready for insertion.
+    
+    Args:
+        user_id: ID of the user who owns the expense
+        description: Description of the expense
+        amount: Amount spent
+        category: Category of the expense
+        now: Timestamp for the expense (default: current time)
+    
+    Returns:
+        Expense document
+    """
+    if now is None:
+        now = datetime.now()
+    return {
+        "user_id": user_id,
+        "description": description,
+        "description_lc": description.lower(),
+        "description_norm": normalize_description(description),
+        "amount": amount,
+        "category": category,
+        "category_lc": category.lower(),
+        "date": datetime.combine(now.date(), time.min),
+        "created_at": now
+    }
+
+
+def expense_to_dict(expense) -> dict:
+    """Convert an expense document into a JSON-serializable dict."""
+    return {
+        "id": str(expense["_id"]),
+        "description": expense["description"],
+        "amount": expense["amount"],
+        "category": expense.get("category"),
+        "date": f"{expense['date']:%Y-%m-%d}"
+    }
+
+
+def iter_expense_rows(expenses):
+    """Yield (_id, description, amount, category, date) tuples from projected expense documents."""
+    for expense in expenses:
+        yield expense["_id"], expense["description"], expense["amount"], expense.get("category", "N/A"), expense["date"]
+
+
+def expense_report(header: str, format_row, expenses, page_size: Optional[int] = None, offset: int = 0):
+    """
+    Yield the report header followed by one formatted row per expense, for a single join.
+    When the rows fill page_size, a footer tells the caller which offset fetches the next page.
+    """
+    yield header
+    count = 0
+    for _id, description, amount, category, date in iter_expense_rows(expenses):
+        count += 1
+        yield format_row(_id=_id, description=description, amount=amount, category=category, date=date)
+    if page_size is not None and count == page_size:
+        yield f"\n📄 Showing {count} expenses from offset {offset}; more may exist. Call again with offset={offset + count} for the next page.\n"
+
+
+def capped_limit(limit: int) -> int:
+    """Clamp a requested page size to MAX_ROWS (a limit of 0 or less means "as many as allowed")."""
+    return min(limit, MAX_ROWS) if limit > 0 else MAX_ROWS
+
+
+INVALID_OFFSET_MESSAGE = "❌ offset must be 0 or greater"
+
+
+def expenses_to_json(expenses) -> str:
+    """Serialize an iterable of expense documents as a compact JSON payload."""
+    items = [expense_to_dict(expense) for expense in expenses]
+    return json.dumps({"expenses": items, "count": len(items)}, separators=(",", ":"))
+
+
+# Rendered category listings, rebuilt only when categories.json changes
+_CATEGORIES_CACHE = {"mtime": None, "resource": None, "tool": None}
+
+
+def _render_categories(mtime: int) -> None:
+    """
+    Load categories.json and render both category listings into the cache.
+    
+    Args:
+        mtime: Modification time of the file (in nanoseconds) the listings are built from
+    """
+    with open(CATEGORIES_PATH, 'rb') as f:
+        raw = f.read()
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+    categories_data = orjson.loads(raw) if orjson else json.loads(raw)
+    
+    header = "📂 Available Expense Categories\n" + "=" * 70 + "\n\n"
+    resource = io.StringIO()
+    tool = io.StringIO()
+    resource.write(header)
+    tool.write(header)
+    
+    for category in categories_data.get('categories', []):
+        line = f"{category['icon']} {category['name']} (ID: {category['id']})\n"
+        resource.write(line)
+        tool.write(line)
+        if 'subcategories' in category:
+            tool.write("   Subcategories:\n")
+            for subcat in category['subcategories']:
+                resource.write(f"   └─ {subcat['name']} (ID: {subcat['id']})\n")
+                tool.write(f"   • {subcat['name']} (ID: {subcat['id']})\n")
+        resource.write("\n")
+        tool.write("\n")
+    
+    _CATEGORIES_CACHE.update(mtime=mtime, resource=resource.getvalue(), tool=tool.getvalue())
+
+
+def _get_categories_listing(variant: str) -> str:
+    """
+    Return a rendered category listing, re-rendering if categories.json changed.
+    
+    Args:
+        variant: "resource" for the MCP resource layout, "tool" for the tool layout
+    
+    Returns:
+        Formatted list of all categories with their subcategories
+    """
+    mtime = os.stat(CATEGORIES_PATH).st_mtime_ns
+    if mtime != _CATEGORIES_CACHE["mtime"]:
+        _render_categories(mtime)
+    return _CATEGORIES_CACHE[variant]
+
+
+# Render at import so the first request is served from the cache; any
+# error is reported by the category tools when they are called
+try:
+    _render_categories(os.stat(CATEGORIES_PATH).st_mtime_ns)
+except Exception:
+    pass
+
+
 @mcp.resource("categories://list")
 def get_categories_resource() -> str:
     """
@@ -300,20 +740,7 @@ def get_categories_resource() -> str:
     Access this resource to see all valid categories and subcategories for expenses.
     """
     try:
-        with open(CATEGORIES_PATH, 'r') as f:
-            categories_data = json.load(f)
-        
-        result = "📂 Available Expense Categories\n"
-        result += "=" * 70 + "\n\n"
-        
-        for category in categories_data.get('categories', []):
-            result += f"{category['icon']} {category['name']} (ID: {category['id']})\n"
-            if 'subcategories' in category:
-                for subcat in category['subcategories']:
-                    result += f"   └─ {subcat['name']} (ID: {subcat['id']})\n"
-            result += "\n"
-        
-        return result
+        return _get_categories_listing("resource")
     except FileNotFoundError:
         return "Error: categories.json file not found"
     except json.JSONDecodeError:
@@ -332,21 +759,7 @@ def list_available_categories() -> str:
         Formatted list of all categories with their subcategories
     """
     try:
-        with open(CATEGORIES_PATH, 'r') as f:
-            categories_data = json.load(f)
-        
-        result = "📂 Available Expense Categories\n"
-        result += "=" * 70 + "\n\n"
-        
-        for category in categories_data.get('categories', []):
-            result += f"{category['icon']} {category['name']} (ID: {category['id']})\n"
-            if 'subcategories' in category:
-                result += "   Subcategories:\n"
-                for subcat in category['subcategories']:
-                    result += f"   • {subcat['name']} (ID: {subcat['id']})\n"
-            result += "\n"
-        
-        return result
+        return _get_categories_listing("tool")
     except FileNotFoundError:
         return "❌ Error: categories.json file not found"
     except json.JSONDecodeError:
@@ -375,31 +788,69 @@ def add_expense(session_token: str, description: str, amount: float, category: s
         if not user:
             return "❌ Invalid session token. Please login first."
         
-        db = get_db_connection()
-        expenses_collection = db["expenses"]
-        
-        expense_doc = {
-            "user_id": user["_id"],
-            "description": description,
-            "amount": amount,
-            "category": category,
-            "date": datetime.now().strftime("%Y-%m-%d"),
-            "created_at": datetime.now()
-        }
+        expense_doc = build_expense_doc(user["_id"], description, amount, category)
         
-        result = expenses_collection.insert_one(expense_doc)
+        result = get_expenses_collection().insert_one(expense_doc)
         return f"✓ Expense added successfully with ID: {result.inserted_id}"
     except PyMongoError as e:
         return f"❌ Error adding expense: {str(e)}"
 
 
 @mcp.tool
-def list_all_expense(session_token: str) -> str:
+def bulk_add_expenses(session_token: str, items: list[dict]) -> str:
     """
-    List all expenses for the logged-in user.
+    Add several expenses in one call for the logged-in user.
+    Prefer this over repeated add_expense calls when importing many expenses.
+    
+    Args:
+        session_token: User's session token (obtained from login)
+        items: List of expenses, each with "description", "amount" and "category" keys
+    
+    Returns:
+        Success message with the number of expenses added or error
+    """
+    try:
+        # Verify user session
+        user = get_user_from_token(session_token)
+        if not user:
+            return "❌ Invalid session token. Please login first."
+        
+        if not items:
+            return "❌ No expenses provided"
+        
+        # One timestamp for the whole batch
+        now = datetime.now()
+        expense_docs = []
+        for index, item in enumerate(items):
+            missing = [key for key in ("description", "amount", "category") if key not in item]
+            if missing:
+                return f"❌ Expense at position {index} is missing: {', '.join(missing)}"
+            not_text = [key for key in ("description", "category") if not isinstance(item[key], str)]
+            if not_text:
+                return f"❌ Expense at position {index} must have text values for: {', '.join(not_text)}"
+            amount = parse_amount(item["amount"])
+            if amount is None:
+                return f"❌ Expense at position {index} has an invalid amount: {item['amount']!r}"
+            expense_docs.append(
+                build_expense_doc(user["_id"], item["description"], amount, item["category"], now)
+            )
+        
+        result = get_expenses_collection().insert_many(expense_docs, ordered=False)
+        return f"✓ Added {len(result.inserted_ids)} expense(s) successfully"
+    except PyMongoError as e:
+        return f"❌ Error adding expenses: {str(e)}"
+
+
+@mcp.tool
+def list_all_expense(session_token: str, limit: int = 200, offset: int = 0, output_format: Literal["text", "json"] = "text") -> str:
+    """
+    List all expenses for the logged-in user, newest first.
     
     Args:
         session_token: User's session token
+        limit: Maximum number of expenses to return (default: 200, capped at MAX_ROWS)
+        offset: Number of expenses to skip, for paging through results (default: 0, must not be negative)
+        output_format: "text" for a formatted report (default) or "json" for compact structured data
     
     Returns:
         List of user's expenses
@@ -410,21 +861,26 @@ def list_all_expense(session_token: str) -> str:
         if not user:
             return "❌ Invalid session token. Please login first."
         
-        db = get_db_connection()
-        expenses_collection = db["expenses"]
-        
-        expenses = list(expenses_collection.find({"user_id": user["_id"]}).sort("_id", 1))
-        
-        if expenses:
-            result = f"📋 Your Expenses (User: {user['username']}):\n" + "="*60 + "\n"
-            for expense in expenses:
-                result += f"ID: {expense['_id']}\n"
-                result += f"  Description: {expense['description']}\n"
-                result += f"  Amount: ${expense['amount']:.2f}\n"
-                result += f"  Category: {expense.get('category', 'N/A')}\n"
-                result += f"  Date: {expense['date']}\n"
-                result += "-"*60 + "\n"
-            return result
+        if offset < 0:
+            return INVALID_OFFSET_MESSAGE
+        
+        # Newest first; date_id walked in reverse provides this order without a blocking sort
+        cursor = (
+            get_raw_expenses_collection().find({"user_id": user["_id"]}, EXPENSE_LIST_FIELDS)
+            .sort([("date", -1), ("_id", -1)])
+            .skip(offset)
+            .limit(capped_limit(limit))
+            .batch_size(200)
+        )
+        
+        if output_format == "json":
+            return expenses_to_json(cursor)
+        
+        header = f"📋 Your Expenses (User: {user['username']}):\n" + "="*60 + "\n"
+        report = "".join(expense_report(header, format_expense_row, cursor, capped_limit(limit), offset))
+        
+        if len(report) > len(header):
+            return report
         else:
             return "No expenses found for your account"
     except PyMongoError as e:
@@ -432,13 +888,20 @@ def list_all_expense(session_token: str) -> str:
 
 
 @mcp.tool
-def search_expense(session_token: str, search_term: str) -> str:
+def search_expense(session_token: str, search_term: str, limit: int = 200, offset: int = 0, output_format: Literal["text", "json"] = "text") -> str:
     """
     Search for expenses by description or category for the logged-in user.
+    Words are matched using the text index (best matches first); terms containing
+    punctuation (e.g. "c++", "-coffee", "joe's") are matched literally as a
+    case-insensitive prefix.
+    The search term is never interpreted as a regular expression or text search operator.
     
     Args:
         session_token: User's session token
-        search_term: Text to search for in description or category
+        search_term: Words to search for in description or category
+        limit: Maximum number of expenses to return (default: 200, capped at MAX_ROWS)
+        offset: Number of expenses to skip, for paging through results (default: 0, must not be negative)
+        output_format: "text" for a formatted report (default) or "json" for compact structured data
     
     Returns:
         Formatted list of matching expenses
@@ -449,30 +912,46 @@ def search_expense(session_token: str, search_term: str) -> str:
         if not user:
             return "❌ Invalid session token. Please login first."
         
-        db = get_db_connection()
-        expenses_collection = db["expenses"]
+        if offset < 0:
+            return INVALID_OFFSET_MESSAGE
+        
+        if PUNCTUATION.search(search_term):
+            # Prefix search on the lowercased copies so the (user_id, *_lc) indexes
+            # can be range-scanned instead of regex-matching every document
+            # A compiled pattern is sent as a native BSON regex
+            prefix = re.compile(f"^{re.escape(search_term.lower())}")
+            # Expenses not yet backfilled by migrate_expense_search_fields lack the
+            # lowercased copies, so match their raw fields case-insensitively
+            legacy_prefix = re.compile(f"^{re.escape(search_term)}", re.IGNORECASE)
+            query = {
+                "user_id": user["_id"],
+                "$or": [
+                    {"description_lc": prefix},
+                    {"category_lc": prefix},
+                    {"description_lc": {"$exists": False}, "description": legacy_prefix},
+                    {"category_lc": {"$exists": False}, "category": legacy_prefix}
+                ]
+            }
+            cursor = get_raw_expenses_collection().find(query, EXPENSE_LIST_FIELDS).sort("_id", 1)
+        else:
+            # Full-text search on the desc_cat_text index, best matches first
+            query = {
+                "user_id": user["_id"],
+                "$text": {"$search": search_term}
+            }
+            score = {**EXPENSE_LIST_FIELDS, "score": {"$meta": "textScore"}}
+            cursor = get_raw_expenses_collection().find(query, score).sort([("score", {"$meta": "textScore"}), ("_id", 1)])
         
-        # Search in description and category using regex, filtered by user_id
-        query = {
-            "user_id": user["_id"],
-            "$or": [
-                {"description": {"$regex": search_term, "$options": "i"}},
-                {"category": {"$regex": search_term, "$options": "i"}}
-            ]
-        }
+        cursor = cursor.skip(offset).limit(capped_limit(limit))
         
-        expenses = list(expenses_collection.find(query).sort("_id", 1))
-        
-        if expenses:
-            result = f"🔍 Search results for '{search_term}' (User: {user['username']}):\n" + "="*60 + "\n"
-            for expense in expenses:
-                result += f"ID: {expense['_id']}\n"
-                result += f"  Description: {expense['description']}\n"
-                result += f"  Amount: ${expense['amount']:.2f}\n"
-                result += f"  Category: {expense.get('category', 'N/A')}\n"
-                result += f"  Date: {expense['date']}\n"
-                result += "-"*60 + "\n"
-            return result
+        if output_format == "json":
+            return expenses_to_json(cursor)
+        
+        header = f"🔍 Search results for '{search_term}' (User: {user['username']}):\n" + "="*60 + "\n"
+        report = "".join(expense_report(header, format_expense_row, cursor, capped_limit(limit), offset))
+        
+        if len(report) > len(header):
+            return report
         else:
             return f"No expenses found matching '{search_term}'"
     except PyMongoError as e:
@@ -480,7 +959,7 @@ def search_expense(session_token: str, search_term: str) -> str:
 
 
 @mcp.tool
-def get_expense_details_by_date_and_category(session_token: str, start_date: str, end_date: str, category: Optional[str] = None) -> str:
+def get_expense_details_by_date_and_category(session_token: str, start_date: str, end_date: str, category: Optional[str] = None, limit: int = 200, offset: int = 0, output_format: Literal["text", "json"] = "text") -> str:
     """
     Get detailed list of expenses between two dates for the logged-in user, optionally filtered by category.
 
@@ -489,6 +968,9 @@ def get_expense_details_by_date_and_category(session_token: str, start_date: str
         start_date: The start date of the range (format: YYYY-MM-DD)
         end_date: The end date of the range (format: YYYY-MM-DD)
         category: The category to filter by (optional)
+        limit: Maximum number of expenses to return (default: 200, capped at MAX_ROWS)
+        offset: Number of expenses to skip, for paging through results (default: 0, must not be negative)
+        output_format: "text" for a formatted report (default) or "json" for compact structured data
 
     Returns:
         Detailed list of expenses with all information
@@ -499,35 +981,40 @@ def get_expense_details_by_date_and_category(session_token: str, start_date: str
         if not user:
             return "❌ Invalid session token. Please login first."
         
-        db = get_db_connection()
-        expenses_collection = db["expenses"]
+        if offset < 0:
+            return INVALID_OFFSET_MESSAGE
+        
+        try:
+            start = parse_date(start_date)
+            end = parse_date(end_date)
+        except ValueError:
+            return "❌ Invalid date format. Use YYYY-MM-DD"
         
         # Build query based on whether category is provided
         query: dict = {
             "user_id": user["_id"],
-            "date": {"$gte": start_date, "$lte": end_date}
+            "date": {"$gte": start, "$lte": end}
         }
         
         if category:
             query["category"] = category
         
-        expenses = list(expenses_collection.find(query).sort([("date", 1), ("_id", 1)]))
+        # Pin the planner to the compound index matching this query shape
+        index_hint = "category_date" if category else "date_id"
+        cursor = get_expenses_collection().find(query, EXPENSE_LIST_FIELDS).sort([("date", 1), ("_id", 1)]).hint(index_hint).skip(offset).limit(capped_limit(limit))
 
-        if expenses:
-            if category:
-                result = f"📋 Expenses in '{category}' ({start_date} to {end_date}):\n"
-            else:
-                result = f"📋 All Expenses ({start_date} to {end_date}):\n"
-            result += "=" * 60 + "\n"
-            
-            for expense in expenses:
-                result += f"ID: {expense['_id']}\n"
-                result += f"  Date: {expense['date']}\n"
-                result += f"  Description: {expense['description']}\n"
-                result += f"  Category: {expense.get('category', 'N/A')}\n"
-                result += f"  Amount: ${expense['amount']:.2f}\n"
-                result += "-" * 60 + "\n"
-            return result
+        if output_format == "json":
+            return expenses_to_json(cursor)
+        
+        if category:
+            header = f"📋 Expenses in '{category}' ({start_date} to {end_date}):\n" + "=" * 60 + "\n"
+        else:
+            header = f"📋 All Expenses ({start_date} to {end_date}):\n" + "=" * 60 + "\n"
+        
+        report = "".join(expense_report(header, format_dated_expense_row, cursor, capped_limit(limit), offset))
+        
+        if len(report) > len(header):
+            return report
         else:
             if category:
                 return f"No expenses found in category '{category}' between {start_date} and {end_date}"
@@ -538,7 +1025,7 @@ def get_expense_details_by_date_and_category(session_token: str, start_date: str
 
 
 @mcp.tool
-def get_expense_summary_by_date_and_category(session_token: str, start_date: str, end_date: str, category: Optional[str] = None) -> str:
+def get_expense_summary_by_date_and_category(session_token: str, start_date: str, end_date: str, category: Optional[str] = None, output_format: Literal["text", "json"] = "text") -> str:
     """
     Get grouped summary of expenses between two dates for the logged-in user, optionally filtered and grouped by category.
     
@@ -547,6 +1034,7 @@ def get_expense_summary_by_date_and_category(session_token: str, start_date: str
         start_date: The start date of the range (format: YYYY-MM-DD)
         end_date: The end date of the range (format: YYYY-MM-DD)
         category: The category to filter by (optional)
+        output_format: "text" for a formatted report (default) or "json" for compact structured data
     
     Returns:
         Formatted summary with expenses grouped by category, showing totals
@@ -557,106 +1045,137 @@ def get_expense_summary_by_date_and_category(session_token: str, start_date: str
         if not user:
             return "❌ Invalid session token. Please login first."
         
-        db = get_db_connection()
-        expenses_collection = db["expenses"]
+        try:
+            start = parse_date(start_date)
+            end = parse_date(end_date)
+        except ValueError:
+            return "❌ Invalid date format. Use YYYY-MM-DD"
         
         # Build query based on whether category is provided
         query: dict = {
             "user_id": user["_id"],
-            "date": {"$gte": start_date, "$lte": end_date}
+            "date": {"$gte": start, "$lte": end}
         }
         
         if category:
             query["category"] = category
         
-        expenses = list(expenses_collection.find(query).sort([("category", 1), ("date", 1)]))
-        
-        if not expenses:
+        # Group and total server-side; one round-trip returns the per-category
+        # groups alongside the grand total and expense count
+        pipeline = [
+            {"$match": query},
+            {"$sort": {"category": 1, "date": 1}},
+            {"$facet": {
+                "groups": [
+                    {"$group": {
+                        "_id": {"$ifNull": ["$category", "Uncategorized"]},
+                        "total": {"$sum": "$amount"},
+                        "items": {"$push": {"date": "$date", "description": "$description", "amount": "$amount"}}
+                    }},
+                    {"$sort": {"_id": 1}}
+                ],
+                "summary": [
+                    {"$group": {"_id": None, "grand": {"$sum": "$amount"}, "count": {"$sum": 1}}}
+                ]
+            }}
+        ]
+        # category_date serves both the match and the (category, date) sort
+        facets = next(get_expenses_collection().aggregate(pipeline, hint="category_date"))
+        
+        if output_format == "json":
+            summary = facets["summary"][0] if facets["summary"] else {"grand": 0.0, "count": 0}
+            return json.dumps({
+                "categories": [
+                    {
+                        "category": group["_id"],
+                        "total": group["total"],
+                        "expenses": [
+                            {"date": f"{item['date']:%Y-%m-%d}", "description": item["description"], "amount": item["amount"]}
+                            for item in group["items"]
+                        ]
+                    }
+                    for group in facets["groups"]
+                ],
+                "total": summary["grand"],
+                "count": summary["count"]
+            }, separators=(",", ":"))
+        
+        if not facets["summary"]:
             if category:
                 return f"No expenses found in category '{category}' between {start_date} and {end_date}"
             else:
                 return f"No expenses found between {start_date} and {end_date}"
         
-        # Group expenses by category
-        grouped_expenses = {}
-        grand_total = 0.0
-        
-        for expense in expenses:
-            cat = expense.get('category', 'Uncategorized')
-            if cat not in grouped_expenses:
-                grouped_expenses[cat] = {
-                    'expenses': [],
-                    'total': 0.0
-                }
-            
-            expense_data = {
-                'date': expense['date'],
-                'description': expense['description'],
-                'amount': expense['amount']
-            }
-            grouped_expenses[cat]['expenses'].append(expense_data)
-            grouped_expenses[cat]['total'] += expense['amount']
-            grand_total += expense['amount']
+        groups = facets["groups"]
+        summary = facets["summary"][0]
         
         # Format output
-        result = f"📊 Expense Summary ({start_date} to {end_date})\n"
-        result += "=" * 70 + "\n\n"
-        
-        for cat, data in sorted(grouped_expenses.items()):
-            result += f"📁 Category: {cat}\n"
-            result += f"   Total: ${data['total']:.2f}\n"
-            result += "-" * 70 + "\n"
+        buf = io.StringIO()
+        buf.write(f"📊 Expense Summary ({start_date} to {end_date})\n")
+        buf.write("=" * 70 + "\n\n")
+        
+        for group in groups:
+            buf.write(f"📁 Category: {group['_id']}\n")
+            buf.write(f"   Total: ${group['total']:.2f}\n")
+            buf.write("-" * 70 + "\n")
             
-            for expense in data['expenses']:
-                result += f"   • {expense['date']} | {expense['description']}: ${expense['amount']:.2f}\n"
+            for expense in group['items']:
+                buf.write(format_summary_item(expense))
             
-            result += "\n"
+            buf.write("\n")
         
-        result += "=" * 70 + "\n"
-        result += f"💰 GRAND TOTAL: ${grand_total:.2f}\n"
-        result += f"📈 Categories: {len(grouped_expenses)}\n"
-        result += f"📝 Total Expenses: {len(expenses)}\n"
+        buf.write("=" * 70 + "\n")
+        buf.write(f"💰 GRAND TOTAL: ${summary['grand']:.2f}\n")
+        buf.write(f"📈 Categories: {len(groups)}\n")
+        buf.write(f"📝 Total Expenses: {summary['count']}\n")
         
-        return result
+        return buf.getvalue()
         
     except PyMongoError as e:
         return f"❌ Error retrieving expenses: {str(e)}"
 
 
 @mcp.tool
-def get_expense_details(session_token: str, expense_id: str) -> str:
+def get_expense_details(session_token: str, expense_id: str, output_format: Literal["text", "json"] = "text") -> str:
     """
     Get detailed information about a specific expense by ID for the logged-in user.
     
     Args:
         session_token: User's session token
         expense_id: The MongoDB ObjectId of the expense to retrieve (as string)
+        output_format: "text" for a formatted report (default) or "json" for compact structured data
     
     Returns:
         Detailed expense information
     """
+    # Reject malformed IDs before touching the database
+    if not ObjectId.is_valid(expense_id):
+        return f"❌ Invalid expense ID '{expense_id}'"
+    
     try:
         # Verify user session
         user = get_user_from_token(session_token)
         if not user:
             return "❌ Invalid session token. Please login first."
         
-        db = get_db_connection()
-        expenses_collection = db["expenses"]
-        
-        expense = expenses_collection.find_one({"_id": ObjectId(expense_id), "user_id": user["_id"]})
-        
-        if expense:
-            result = f"📄 Expense Details (ID: {expense['_id']}):\n" + "="*60 + "\n"
-            result += f"Description: {expense['description']}\n"
-            result += f"Amount: ${expense['amount']:.2f}\n"
-            result += f"Category: {expense.get('category', 'N/A')}\n"
-            result += f"Date: {expense['date']}\n"
-            result += f"Created: {expense['created_at']}\n"
-            return result
+        expense = get_expenses_collection().find_one({"_id": ObjectId(expense_id), "user_id": user["_id"]}, EXPENSE_DETAIL_FIELDS)
+        
+        if expense and output_format == "json":
+            details = expense_to_dict(expense)
+            details["created_at"] = expense["created_at"].isoformat()
+            return json.dumps(details, separators=(",", ":"))
+        elif expense:
+            return (
+                f"📄 Expense Details (ID: {expense['_id']}):\n" + "="*60 + "\n"
+                f"Description: {expense['description']}\n"
+                f"Amount: ${expense['amount']:.2f}\n"
+                f"Category: {expense.get('category', 'N/A')}\n"
+                f"Date: {expense['date']:%Y-%m-%d}\n"
+                f"Created: {expense['created_at']}\n"
+            )
         else:
             return f"❌ Expense with ID {expense_id} not found or doesn't belong to you"
-    except Exception as e:
+    except PyMongoError as e:
         return f"❌ Error getting expense: {str(e)}"
 
 
@@ -664,6 +1183,7 @@ def get_expense_details(session_token: str, expense_id: str) -> str:
 def delete_expense(session_token: str, description: str) -> str:
     """
     Delete expenses from the expense tracker database by description for the logged-in user.
+    Matching ignores case and extra whitespace.
     
     Args:
         session_token: User's session token
@@ -678,10 +1198,7 @@ def delete_expense(session_token: str, description: str) -> str:
         if not user:
             return "❌ Invalid session token. Please login first."
         
-        db = get_db_connection()
-        expenses_collection = db["expenses"]
-        
-        result = expenses_collection.delete_many({"user_id": user["_id"], "description": description})
+        result = get_expenses_collection().delete_many(description_match(user["_id"], description))
         
         if result.deleted_count > 0:
             return f"✓ Deleted {result.deleted_count} expense(s) successfully"
@@ -695,6 +1212,7 @@ def delete_expense(session_token: str, description: str) -> str:
 def modify_expense(session_token: str, description: str, amount: float) -> str:
     """
     Modify an expense amount in the expense tracker database for the logged-in user.
+    Matching ignores case and extra whitespace.
     
     Args:
         session_token: User's session token
@@ -702,7 +1220,7 @@ def modify_expense(session_token: str, description: str, amount: float) -> str:
         amount: New amount for the expense(s)
     
     Returns:
-        Success or error message
+        Success message listing the modified expense IDs, or error message
     """
     try:
         # Verify user session
@@ -710,16 +1228,20 @@ def modify_expense(session_token: str, description: str, amount: float) -> str:
         if not user:
             return "❌ Invalid session token. Please login first."
         
-        db = get_db_connection()
-        expenses_collection = db["expenses"]
+        match = description_match(user["_id"], description)
         
-        result = expenses_collection.update_many(
-            {"user_id": user["_id"], "description": description},
-            {"$set": {"amount": amount}}
-        )
+        # Read the updated expenses back in the same causally consistent session,
+        # so callers don't need a follow-up list_all_expense call to see them
+        expenses_collection = get_expenses_collection()
+        with get_client().start_session() as session:
+            result = expenses_collection.update_many(match, {"$set": {"amount": amount}}, session=session)
+            updated = list(expenses_collection.find(match, {"_id": 1, "amount": 1}, session=session))
         
         if result.modified_count > 0:
-            return f"✓ Modified {result.modified_count} expense(s) successfully"
+            parts = [f"✓ Modified {result.modified_count} expense(s) successfully\n"]
+            for expense in updated:
+                parts.append(f"  ID: {expense['_id']} | Amount: ${expense['amount']:.2f}\n")
+            return "".join(parts)
         else:
             return f"❌ No expenses found with description '{description}'"
     except PyMongoError as e:
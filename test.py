@@ -1,10 +1,23 @@
 import sqlite3
+import asyncio
+import atexit
+import functools
 import json
+import math
 import os
+import re
+import threading
+from contextlib import contextmanager
 from typing import Optional
 
 from fastmcp import FastMCP
 
+# Optional faster JSON parser for categories.json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 mcp = FastMCP("Expense Tracker")
 
@@ -15,6 +28,86 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "database.db")
 CATEGORIES_PATH = os.path.join(BASE_DIR, "categories.json")
 
+# Applied once to the shared connection. WAL lets readers run while a write
+# is in progress. With synchronous=NORMAL a commit is an append to the WAL
+# with no fsync; the WAL is synced at checkpoints instead. Committed writes
+# survive an application crash, but the latest ones can be lost if the machine
+# loses power. The rest keep temp data and a 64 MiB page cache in memory.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Report rules, built once
+BAR60 = "=" * 60 + "\n"
+BAR70 = "=" * 70 + "\n"
+SEP60 = "-" * 60 + "\n"
+SEP70 = "-" * 70 + "\n"
+
+# The full-text tokenizer splits on punctuation, including "_", so search terms
+# containing any (e.g. "c++", "a&b", "item_1") fall back to an indexed
+# case-insensitive prefix match
+PUNCTUATION = re.compile(r"[^\w\s]|_")
+
+INSERT_EXPENSE_SQL = "INSERT INTO expenses (description, amount, category) VALUES (?, ?, ?)"
+
+# Long-lived connections, opened on first use, so each call reuses a warm page
+# cache instead of reconnecting. SQLite allows a single writer at a time, so
+# writes share one connection and serialize on _write_lock. Reads use one
+# connection per worker thread, which WAL lets run alongside each other and
+# alongside a write.
+_conn: Optional[sqlite3.Connection] = None
+_conn_lock = threading.Lock()
+_write_lock = threading.Lock()
+_read_local = threading.local()
+
+
+# Expenses schema. Everything is IF NOT EXISTS, so the script is safe to rerun.
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS expenses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    description TEXT NOT NULL,
+    amount REAL NOT NULL,
+    category TEXT,
+    date TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Date range lookups, and category filters / category-then-date ordering
+CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses(date);
+CREATE INDEX IF NOT EXISTS idx_expenses_cat_date ON expenses(category, date);
+-- Description matches used by delete_expense / modify_expense
+CREATE INDEX IF NOT EXISTS idx_expenses_desc ON expenses(description);
+-- Case-insensitive prefix matches used by search_expense (LIKE 'term%')
+CREATE INDEX IF NOT EXISTS idx_expenses_desc_nc ON expenses(description COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_expenses_cat_nc ON expenses(category COLLATE NOCASE);
+
+-- Full-text index over description and category, kept in sync by triggers.
+-- It is an external-content table, so only the index is stored.
+CREATE VIRTUAL TABLE IF NOT EXISTS expenses_fts
+USING fts5(description, category, content='expenses', content_rowid='id');
+
+CREATE TRIGGER IF NOT EXISTS expenses_fts_ai AFTER INSERT ON expenses BEGIN
+    INSERT INTO expenses_fts(rowid, description, category)
+    VALUES (new.id, new.description, new.category);
+END;
+
+CREATE TRIGGER IF NOT EXISTS expenses_fts_ad AFTER DELETE ON expenses BEGIN
+    INSERT INTO expenses_fts(expenses_fts, rowid, description, category)
+    VALUES ('delete', old.id, old.description, old.category);
+END;
+
+-- Amount-only updates leave the text unchanged, so they don't touch the index
+CREATE TRIGGER IF NOT EXISTS expenses_fts_au AFTER UPDATE OF description, category ON expenses BEGIN
+    INSERT INTO expenses_fts(expenses_fts, rowid, description, category)
+    VALUES ('delete', old.id, old.description, old.category);
+    INSERT INTO expenses_fts(rowid, description, category)
+    VALUES (new.id, new.description, new.category);
+END;
+"""
+
 
 def get_db_connection(db_path: str = DB_PATH) -> sqlite3.Connection:
     """
@@ -46,19 +139,25 @@ def init_database(db_path: str = DB_PATH) -> None:
         conn = get_db_connection(db_path)
         cursor = conn.cursor()
         
-        # Create expenses table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS expenses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                description TEXT NOT NULL,
-                amount REAL NOT NULL,
-                category TEXT,
-                date TEXT DEFAULT CURRENT_TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        conn.commit()
+        # Checked before the schema script runs, since it creates both
+        columns = {column[1] for column in cursor.execute("PRAGMA table_info(expenses)")}
+        fts_exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'expenses_fts'"
+        ).fetchone()
+        
+        script = ["BEGIN;", SCHEMA_SQL]
+        # Older databases also stored created_at, which always equalled date
+        if "created_at" in columns and sqlite3.sqlite_version_info >= (3, 35, 0):
+            script.append("ALTER TABLE expenses DROP COLUMN created_at;")
+        if not fts_exists:
+            # Index any expenses stored before the full-text table existed
+            script.append("INSERT INTO expenses_fts(expenses_fts) VALUES ('rebuild');")
+        # Refresh planner statistics so the indexes are actually chosen
+        script.append("ANALYZE;")
+        script.append("COMMIT;")
+        
+        # All schema statements run as one script in a single transaction
+        cursor.executescript("\n".join(script))
         print(f"✓ Database initialized successfully at {db_path}")
         
     except sqlite3.Error as e:
@@ -69,6 +168,175 @@ def init_database(db_path: str = DB_PATH) -> None:
         if conn:
             conn.close()
 
+
+def _open_connection() -> sqlite3.Connection:
+    """
+    Open an autocommit connection with the tuned pragmas applied, closed at exit.
+    
+    Returns:
+        sqlite3.Connection: Database connection object
+    """
+    # All tool SQL is literal text, so each statement is prepared once per
+    # connection and then reused from the statement cache
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None, cached_statements=512)
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    atexit.register(conn.close)
+    return conn
+
+
+def get_shared_connection() -> sqlite3.Connection:
+    """
+    Return the connection shared by the write tools, creating it on first use.
+    
+    Returns:
+        sqlite3.Connection: Autocommit connection with the tuned pragmas applied
+    """
+    global _conn
+    if _conn is None:
+        with _conn_lock:
+            if _conn is None:
+                _conn = _open_connection()
+    return _conn
+
+
+def get_read_connection() -> sqlite3.Connection:
+    """
+    Return the calling thread's read connection, creating it on first use.
+    
+    Returns:
+        sqlite3.Connection: Autocommit connection with the tuned pragmas applied
+    """
+    conn = getattr(_read_local, "conn", None)
+    if conn is None:
+        conn = _read_local.conn = _open_connection()
+    return conn
+
+
+def run_in_thread(func):
+    """
+    Wrap a blocking tool as a coroutine that runs it in a worker thread, so
+    database calls don't hold up the server's event loop.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def write_transaction():
+    """
+    Run the enclosed writes as a single transaction on the shared connection.
+    
+    Yields:
+        sqlite3.Connection: The shared connection, held under the write lock
+    """
+    with _write_lock:
+        conn = get_shared_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+@contextmanager
+def read_transaction():
+    """
+    Run the enclosed reads against one consistent snapshot of the database,
+    so concurrent writes can't land between them.
+    
+    Yields:
+        sqlite3.Connection: The calling thread's read connection
+    """
+    conn = get_read_connection()
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    finally:
+        conn.commit()
+
+
+def insert_expenses(rows: list[tuple]) -> None:
+    """
+    Insert (description, amount, category) rows in one transaction.
+    
+    Args:
+        rows: Expense rows to insert
+    """
+    with write_transaction() as conn:
+        conn.executemany(INSERT_EXPENSE_SQL, rows)
+
+
+def parse_amount(value) -> Optional[float]:
+    """Coerce an expense amount (a number or numeric string) to a finite float; None if it isn't one."""
+    if isinstance(value, bool):
+        return None
+    try:
+        amount = float(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    # "nan", "inf" and out-of-range values like "1e400" would poison every total
+    return amount if math.isfinite(amount) else None
+
+
+def build_fts_query(search_term: str) -> str:
+    """
+    Turn free text into an FTS5 query matching every word as a prefix.
+    Words are quoted, so FTS5 operators and punctuation in the term are taken literally.
+    
+    Args:
+        search_term: Text entered by the user
+    
+    Returns:
+        FTS5 MATCH expression
+    """
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in search_term.split())
+
+
+def expense_report(header: str, rows):
+    """
+    Yield the report header followed by one formatted block per expense row.
+    
+    Args:
+        header: Report heading
+        rows: (id, description, amount, category, date) rows, e.g. a cursor
+    """
+    yield header
+    for expense_id, description, amount, category, date in rows:
+        yield (
+            f"ID: {expense_id}\n"
+            f"  Description: {description}\n"
+            f"  Amount: ${amount:.2f}\n"
+            f"  Category: {category or 'N/A'}\n"
+            f"  Date: {date}\n"
+            f"{SEP60}"
+        )
+
+
+def dated_expense_report(header: str, rows):
+    """
+    Yield the report header followed by one date-first block per expense row.
+    
+    Args:
+        header: Report heading
+        rows: (id, description, amount, category, date) rows, e.g. a cursor
+    """
+    yield header
+    for expense_id, description, amount, category, date in rows:
+        yield (
+            f"ID: {expense_id}\n"
+            f"  Date: {date}\n"
+            f"  Description: {description}\n"
+            f"  Category: {category or 'N/A'}\n"
+            f"  Amount: ${amount:.2f}\n"
+            f"{SEP60}"
+        )
+
+
 def initialize_expense_database() -> str:
     """Initialize the expense tracker database with required tables."""
     try:
@@ -78,6 +346,57 @@ def initialize_expense_database() -> str:
         return f"Error initializing database: {str(e)}"
 
 
+# Rendered category listings, rebuilt only when categories.json changes
+_CATEGORIES_CACHE = {"mtime": None, "resource": None, "tool": None}
+
+
+def _render_categories(mtime: int) -> None:
+    """
+    Load categories.json and render both category listings into the cache.
+    
+    Args:
+        mtime: Modification time of the file (in nanoseconds) the listings are built from
+    """
+    with open(CATEGORIES_PATH, 'rb') as f:
+        raw = f.read()
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+    categories_data = orjson.loads(raw) if orjson else json.loads(raw)
+    
+    header = "📂 Available Expense Categories\n" + BAR70 + "\n"
+    resource_parts = [header]
+    tool_parts = [header]
+    
+    for category in categories_data.get('categories', []):
+        line = f"{category['icon']} {category['name']} (ID: {category['id']})\n"
+        resource_parts.append(line)
+        tool_parts.append(line)
+        if 'subcategories' in category:
+            tool_parts.append("   Subcategories:\n")
+            for subcat in category['subcategories']:
+                resource_parts.append(f"   └─ {subcat['name']} (ID: {subcat['id']})\n")
+                tool_parts.append(f"   • {subcat['name']} (ID: {subcat['id']})\n")
+        resource_parts.append("\n")
+        tool_parts.append("\n")
+    
+    _CATEGORIES_CACHE.update(mtime=mtime, resource="".join(resource_parts), tool="".join(tool_parts))
+
+
+def _get_categories_listing(variant: str) -> str:
+    """
+    Return a rendered category listing, re-rendering if categories.json changed.
+    
+    Args:
+        variant: "resource" for the MCP resource layout, "tool" for the tool layout
+    
+    Returns:
+        Formatted list of all categories with their subcategories
+    """
+    mtime = os.stat(CATEGORIES_PATH).st_mtime_ns
+    if mtime != _CATEGORIES_CACHE["mtime"]:
+        _render_categories(mtime)
+    return _CATEGORIES_CACHE[variant]
+
+
 @mcp.resource("categories://list")
 def get_categories_resource() -> str:
     """
@@ -85,20 +404,7 @@ def get_categories_resource() -> str:
     Access this resource to see all valid categories and subcategories for expenses.
     """
     try:
-        with open(CATEGORIES_PATH, 'r') as f:
-            categories_data = json.load(f)
-        
-        result = "📂 Available Expense Categories\n"
-        result += "=" * 70 + "\n\n"
-        
-        for category in categories_data.get('categories', []):
-            result += f"{category['icon']} {category['name']} (ID: {category['id']})\n"
-            if 'subcategories' in category:
-                for subcat in category['subcategories']:
-                    result += f"   └─ {subcat['name']} (ID: {subcat['id']})\n"
-            result += "\n"
-        
-        return result
+        return _get_categories_listing("resource")
     except FileNotFoundError:
         return "Error: categories.json file not found"
     except json.JSONDecodeError:
@@ -117,21 +423,7 @@ def list_available_categories() -> str:
         Formatted list of all categories with their subcategories
     """
     try:
-        with open(CATEGORIES_PATH, 'r') as f:
-            categories_data = json.load(f)
-        
-        result = "📂 Available Expense Categories\n"
-        result += "=" * 70 + "\n\n"
-        
-        for category in categories_data.get('categories', []):
-            result += f"{category['icon']} {category['name']} (ID: {category['id']})\n"
-            if 'subcategories' in category:
-                result += "   Subcategories:\n"
-                for subcat in category['subcategories']:
-                    result += f"   • {subcat['name']} (ID: {subcat['id']})\n"
-            result += "\n"
-        
-        return result
+        return _get_categories_listing("tool")
     except FileNotFoundError:
         return "❌ Error: categories.json file not found"
     except json.JSONDecodeError:
@@ -140,91 +432,135 @@ def list_available_categories() -> str:
         return f"❌ Error loading categories: {str(e)}"
 
 
-@mcp.tool 
+@mcp.tool
+@run_in_thread
 def add_expense(description: str, amount: float, category: str,) -> str:
-    """Add an expense to the expense tracker database."""
+    """
+    Add an expense to the expense tracker database and return its ID.
+    
+    Writes are durable across application crashes; the most recent ones may be
+    lost on power failure (WAL with synchronous=NORMAL).
+    """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO expenses (description, amount, category)
-            VALUES (?,?,?)   """, (description, amount, category))
-        conn.commit()
-        return "Expense added successfully"
+        with _write_lock:
+            cursor = get_shared_connection().execute(INSERT_EXPENSE_SQL, (description, amount, category))
+        return f"Expense added successfully with ID: {cursor.lastrowid}"
     except sqlite3.Error as e:
         return f"Error adding expense: {str(e)}"   
+
+
+@mcp.tool
+@run_in_thread
+def add_expenses(rows: list[dict]) -> str:
+    """
+    Add several expenses in one call.
+    Prefer this over repeated add_expense calls when importing many expenses:
+    all rows are inserted in a single transaction, so either every row is
+    added or none is, and the batch costs one commit.
+    
+    Args:
+        rows: List of expenses, each with "description", "amount" and "category" keys
+    
+    Returns:
+        Success message with the number of expenses added or error
+    """
+    if not rows:
+        return "❌ No expenses provided"
+    
+    expense_rows = []
+    for index, row in enumerate(rows):
+        missing = [key for key in ("description", "amount", "category") if key not in row]
+        if missing:
+            return f"❌ Expense at position {index} is missing: {', '.join(missing)}"
+        if not isinstance(row["description"], str):
+            return f"❌ Expense at position {index} must have a text description"
+        if row["category"] is not None and not isinstance(row["category"], str):
+            return f"❌ Expense at position {index} must have a text category"
+        amount = parse_amount(row["amount"])
+        if amount is None:
+            return f"❌ Expense at position {index} has an invalid amount: {row['amount']!r}"
+        expense_rows.append((row["description"], amount, row["category"]))
+    
+    try:
+        insert_expenses(expense_rows)
+        return f"Added {len(expense_rows)} expense(s) successfully"
+    except sqlite3.Error as e:
+        return f"Error adding expenses: {str(e)}"
+
+
 @mcp.tool
+@run_in_thread
 def list_all_expense() -> str:
     """List all expenses from the expense tracker database with their IDs."""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM expenses ORDER BY id")
-        rows = cursor.fetchall()
-        if rows:
-            result = "📋 All Expenses:\n" + "="*60 + "\n"
-            for row in rows:
-                result += f"ID: {row['id']}\n"
-                result += f"  Description: {row['description']}\n"
-                result += f"  Amount: ${row['amount']:.2f}\n"
-                result += f"  Category: {row['category'] or 'N/A'}\n"
-                result += f"  Date: {row['date']}\n"
-                result += "-"*60 + "\n"
-            return result
+        cursor = get_read_connection().cursor()
+        cursor.execute("SELECT id, description, amount, category, date FROM expenses ORDER BY id")
+        
+        header = "📋 All Expenses:\n" + BAR60
+        report = "".join(expense_report(header, cursor))
+        
+        if len(report) > len(header):
+            return report
         else:
             return "No expenses found"
     except sqlite3.Error as e:
         return f"Error listing expenses: {str(e)}"
-    finally:
-        if conn:
-            conn.close()
-
 
 @mcp.tool
+@run_in_thread
 def search_expense(search_term: str) -> str:
     """
-    Search for expenses by description, category, or amount.
+    Search for expenses by description or category.
+    Every word in the search term must match the start of a word in the
+    description or category (e.g. "cof" matches "Coffee"), ignoring case.
+    Terms containing punctuation or "_" (e.g. "c++", "item_1") instead match the start of the
+    description or category as literal text.
     Returns matching expenses with their IDs.
     
     Args:
-        search_term: Text to search for in description or category
+        search_term: Words to search for in description or category
     
     Returns:
         Formatted list of matching expenses with IDs
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        cursor = get_read_connection().cursor()
         
-        # Search in description and category
-        cursor.execute("""
-            SELECT * FROM expenses
-            WHERE description LIKE ? OR category LIKE ?
-            ORDER BY id
-        """, (f"%{search_term}%", f"%{search_term}%"))
+        fts_query = build_fts_query(search_term)
+        if not fts_query:
+            return "❌ Please provide a search term"
         
-        rows = cursor.fetchall()
-        if rows:
-            result = f"🔍 Search results for '{search_term}':\n" + "="*60 + "\n"
-            for row in rows:
-                result += f"ID: {row['id']}\n"
-                result += f"  Description: {row['description']}\n"
-                result += f"  Amount: ${row['amount']:.2f}\n"
-                result += f"  Category: {row['category'] or 'N/A'}\n"
-                result += f"  Date: {row['date']}\n"
-                result += "-"*60 + "\n"
-            return result
+        if PUNCTUATION.search(search_term):
+            # Prefix match on the NOCASE indexes; the pattern is bound as a whole
+            # (not built in SQL) so SQLite can turn it into an index range scan
+            escaped = search_term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            prefix = escaped + "%"
+            cursor.execute("""
+                SELECT id, description, amount, category, date FROM expenses
+                WHERE description LIKE ? ESCAPE '\\' OR category LIKE ? ESCAPE '\\'
+                ORDER BY id
+            """, (prefix, prefix))
+        else:
+            # Search in description and category via the full-text index
+            cursor.execute("""
+                SELECT e.id, e.description, e.amount, e.category, e.date FROM expenses_fts
+                JOIN expenses e ON e.id = expenses_fts.rowid
+                WHERE expenses_fts MATCH ?
+                ORDER BY expenses_fts.rowid
+            """, (fts_query,))
+        
+        header = f"🔍 Search results for '{search_term}':\n" + BAR60
+        report = "".join(expense_report(header, cursor))
+        
+        if len(report) > len(header):
+            return report
         else:
             return f"No expenses found matching '{search_term}'"
     except sqlite3.Error as e:
         return f"Error searching expenses: {str(e)}"
-    finally:
-        if conn:
-            conn.close()
 
 @mcp.tool
+@run_in_thread
 def get_expense_details_by_date_and_category(start_date: str, end_date: str, category: Optional[str] = None) -> str:
     """
     Get detailed list of expenses between two dates, optionally filtered by category.
@@ -238,41 +574,32 @@ def get_expense_details_by_date_and_category(start_date: str, end_date: str, cat
         Detailed list of expenses with all information
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        cursor = get_read_connection().cursor()
         
         # Build query based on whether category is provided
+        params = {"start": start_date, "end": end_date, "category": category}
         if category:
             cursor.execute("""
-                SELECT * FROM expenses
-                WHERE date BETWEEN ? AND ? AND category = ?
+                SELECT id, description, amount, category, date FROM expenses
+                WHERE date BETWEEN :start AND :end AND category = :category
                 ORDER BY date, id
-            """, (start_date, end_date, category))
+            """, params)
         else:
             cursor.execute("""
-                SELECT * FROM expenses
-                WHERE date BETWEEN ? AND ?
+                SELECT id, description, amount, category, date FROM expenses
+                WHERE date BETWEEN :start AND :end
                 ORDER BY date, id
-            """, (start_date, end_date))
+            """, params)
         
-        rows = cursor.fetchall()
-
-        if rows:
-            if category:
-                result = f"📋 Expenses in '{category}' ({start_date} to {end_date}):\n"
-            else:
-                result = f"📋 All Expenses ({start_date} to {end_date}):\n"
-            result += "=" * 60 + "\n"
-            
-            for row in rows:
-                result += f"ID: {row['id']}\n"
-                result += f"  Date: {row['date']}\n"
-                result += f"  Description: {row['description']}\n"
-                result += f"  Category: {row['category'] or 'N/A'}\n"
-                result += f"  Amount: ${row['amount']:.2f}\n"
-                result += "-" * 60 + "\n"
-            return result
+        if category:
+            header = f"📋 Expenses in '{category}' ({start_date} to {end_date}):\n" + BAR60
+        else:
+            header = f"📋 All Expenses ({start_date} to {end_date}):\n" + BAR60
+        
+        report = "".join(dated_expense_report(header, cursor))
+        
+        if len(report) > len(header):
+            return report
         else:
             if category:
                 return f"No expenses found in category '{category}' between {start_date} and {end_date}"
@@ -280,11 +607,9 @@ def get_expense_details_by_date_and_category(start_date: str, end_date: str, cat
                 return f"No expenses found between {start_date} and {end_date}"
     except sqlite3.Error as e:
         return f"Error retrieving expenses: {str(e)}"
-    finally:
-        if conn:
-            conn.close()
 
 @mcp.tool
+@run_in_thread
 def get_expense_summary_by_date_and_category(start_date: str, end_date: str, category: Optional[str] = None) -> str:
     """
     Get grouped summary of expenses between two dates, optionally filtered and grouped by category.
@@ -306,85 +631,87 @@ def get_expense_summary_by_date_and_category(start_date: str, end_date: str, cat
         Formatted summary with expenses grouped by category, showing totals
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        # Build query based on whether category is provided
-        if category:
-            # Filter by specific category
-            cursor.execute("""
-                SELECT category, date, description, amount
-                FROM expenses
-                WHERE date BETWEEN ? AND ? AND category = ?
-                ORDER BY category, date
-            """, (start_date, end_date, category))
-        else:
-            # Get all expenses in date range
-            cursor.execute("""
-                SELECT category, date, description, amount
-                FROM expenses
-                WHERE date BETWEEN ? AND ?
-                ORDER BY category, date
-            """, (start_date, end_date))
-        
-        rows = cursor.fetchall()
-        
-        if not rows:
+        # Totals and detail rows are read from the same snapshot, so they always agree
+        with read_transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Build the queries based on whether category is provided
+            params = {"start": start_date, "end": end_date, "category": category}
             if category:
-                return f"No expenses found in category '{category}' between {start_date} and {end_date}"
+                totals_sql = """
+                    SELECT COALESCE(category, 'Uncategorized') AS cat, SUM(amount) AS total, COUNT(*) AS n
+                    FROM expenses
+                    WHERE date BETWEEN :start AND :end AND category = :category
+                    GROUP BY cat
+                    ORDER BY cat
+                """
+                rows_sql = """
+                    SELECT COALESCE(category, 'Uncategorized') AS cat, date, description, amount
+                    FROM expenses
+                    WHERE date BETWEEN :start AND :end AND category = :category
+                    ORDER BY cat, date
+                """
             else:
-                return f"No expenses found between {start_date} and {end_date}"
-        
-        # Group expenses by category
-        grouped_expenses = {}
-        grand_total = 0.0
-        
-        for row in rows:
-            cat = row['category'] or 'Uncategorized'
-            if cat not in grouped_expenses:
-                grouped_expenses[cat] = {
-                    'expenses': [],
-                    'total': 0.0
-                }
+                totals_sql = """
+                    SELECT COALESCE(category, 'Uncategorized') AS cat, SUM(amount) AS total, COUNT(*) AS n
+                    FROM expenses
+                    WHERE date BETWEEN :start AND :end
+                    GROUP BY cat
+                    ORDER BY cat
+                """
+                rows_sql = """
+                    SELECT COALESCE(category, 'Uncategorized') AS cat, date, description, amount
+                    FROM expenses
+                    WHERE date BETWEEN :start AND :end
+                    ORDER BY cat, date
+                """
             
-            expense_data = {
-                'date': row['date'],
-                'description': row['description'],
-                'amount': row['amount']
-            }
-            grouped_expenses[cat]['expenses'].append(expense_data)
-            grouped_expenses[cat]['total'] += row['amount']
-            grand_total += row['amount']
-        
-        # Format output
-        result = f"📊 Expense Summary ({start_date} to {end_date})\n"
-        result += "=" * 70 + "\n\n"
-        
-        for cat, data in sorted(grouped_expenses.items()):
-            result += f"📁 Category: {cat}\n"
-            result += f"   Total: ${data['total']:.2f}\n"
-            result += "-" * 70 + "\n"
+            # Per-category totals and counts are computed by SQLite
+            cursor.execute(totals_sql, params)
+            totals = {}
+            expense_count = 0
+            for cat, total, count in cursor:
+                totals[cat] = total
+                expense_count += count
+            
+            if not totals:
+                if category:
+                    return f"No expenses found in category '{category}' between {start_date} and {end_date}"
+                else:
+                    return f"No expenses found between {start_date} and {end_date}"
+            
+            cursor.execute(rows_sql, params)
+            
+            # Format output; rows arrive grouped by category, already in display order
+            parts = [f"📊 Expense Summary ({start_date} to {end_date})\n" + BAR70 + "\n"]
             
-            for expense in data['expenses']:
-                result += f"   • {expense['date']} | {expense['description']}: ${expense['amount']:.2f}\n"
+            current_cat = None
+            for cat, date, description, amount in cursor:
+                if cat != current_cat:
+                    parts.append(
+                        ("\n" if current_cat is not None else "")
+                        + f"📁 Category: {cat}\n"
+                        f"   Total: ${totals[cat]:.2f}\n"
+                        + SEP70
+                    )
+                    current_cat = cat
             
-            result += "\n"
+                parts.append(f"   • {date} | {description}: ${amount:.2f}\n")
         
-        result += "=" * 70 + "\n"
-        result += f"💰 GRAND TOTAL: ${grand_total:.2f}\n"
-        result += f"📈 Categories: {len(grouped_expenses)}\n"
-        result += f"📝 Total Expenses: {len(rows)}\n"
+        parts.append(
+            "\n" + BAR70
+            + f"💰 GRAND TOTAL: ${sum(totals.values()):.2f}\n"
+            f"📈 Categories: {len(totals)}\n"
+            f"📝 Total Expenses: {expense_count}\n"
+        )
         
-        return result
+        return "".join(parts)
         
     except sqlite3.Error as e:
         return f"Error retrieving expenses: {str(e)}"
-    finally:
-        if conn:
-            conn.close()
 
 @mcp.tool
+@run_in_thread
 def get_expense_details(expense_id: int) -> str:
     """
     Get detailed information about a specific expense by ID.
@@ -396,52 +723,101 @@ def get_expense_details(expense_id: int) -> str:
         Detailed expense information
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM expenses WHERE id = ?", (expense_id,))
+        cursor = get_read_connection().cursor()
+        cursor.execute(
+            "SELECT description, amount, category, date FROM expenses WHERE id = ?",
+            (expense_id,)
+        )
         row = cursor.fetchone()
         
         if row:
-            result = f"📄 Expense Details (ID: {row['id']}):\n" + "="*60 + "\n"
-            result += f"Description: {row['description']}\n"
-            result += f"Amount: ${row['amount']:.2f}\n"
-            result += f"Category: {row['category'] or 'N/A'}\n"
-            result += f"Date: {row['date']}\n"
-            result += f"Created: {row['created_at']}\n"
+            description, amount, category, date = row
+            result = f"📄 Expense Details (ID: {expense_id}):\n" + BAR60
+            result += f"Description: {description}\n"
+            result += f"Amount: ${amount:.2f}\n"
+            result += f"Category: {category or 'N/A'}\n"
+            result += f"Date: {date}\n"
             return result
         else:
             return f"❌ Expense with ID {expense_id} not found"
     except sqlite3.Error as e:
         return f"Error getting expense: {str(e)}"
-    finally:
-        if conn:
-            conn.close()
 
-@mcp.tool 
+@mcp.tool
+@run_in_thread
 def delete_expense(description: str) -> str:  
-    """Delete an expense from the expense tracker database."""
+    """
+    Delete every expense with exactly this description from the expense tracker database.
+    Use delete_expense_by_id to delete a single expense.
+    """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM expenses WHERE description = ?", (description,))
-        conn.commit()
+        with _write_lock:
+            cursor = get_shared_connection().cursor()
+            cursor.execute("DELETE FROM expenses WHERE description = ?", (description,))
         return "Expense deleted successfully"
     except sqlite3.Error as e:
         return f"Error deleting expense: {str(e)}"
 
 @mcp.tool
+@run_in_thread
 def modify_expense(description: str, amount: float) -> str:
-    """Modify an expense amount in the expense tracker database."""
+    """
+    Modify the amount of every expense with exactly this description in the expense tracker database.
+    Use modify_expense_by_id to modify a single expense.
+    """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE expenses SET amount = ? WHERE description = ?", (amount, description))
-        conn.commit()
+        with _write_lock:
+            cursor = get_shared_connection().cursor()
+            cursor.execute("UPDATE expenses SET amount = ? WHERE description = ?", (amount, description))
         return "Expense modified successfully"
     except sqlite3.Error as e:
         return f"Error modifying expense: {str(e)}"
 
+
+@mcp.tool
+@run_in_thread
+def delete_expense_by_id(expense_id: int) -> str:
+    """
+    Delete a single expense by its ID.
+    
+    Args:
+        expense_id: The ID of the expense to delete
+    
+    Returns:
+        Success message or error
+    """
+    try:
+        with _write_lock:
+            cursor = get_shared_connection().execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
+        if cursor.rowcount == 0:
+            return f"❌ Expense with ID {expense_id} not found"
+        return f"Expense {expense_id} deleted successfully"
+    except sqlite3.Error as e:
+        return f"Error deleting expense: {str(e)}"
+
+
+@mcp.tool
+@run_in_thread
+def modify_expense_by_id(expense_id: int, amount: float) -> str:
+    """
+    Modify the amount of a single expense by its ID.
+    
+    Args:
+        expense_id: The ID of the expense to modify
+        amount: The new amount
+    
+    Returns:
+        Success message or error
+    """
+    try:
+        with _write_lock:
+            cursor = get_shared_connection().execute("UPDATE expenses SET amount = ? WHERE id = ?", (amount, expense_id))
+        if cursor.rowcount == 0:
+            return f"❌ Expense with ID {expense_id} not found"
+        return f"Expense {expense_id} modified successfully"
+    except sqlite3.Error as e:
+        return f"Error modifying expense: {str(e)}"
+
 if __name__ == "__main__":
     # Initialize database when running directly
     init_database()